@@ -49,7 +49,8 @@ as well as the attributes of Pid instance are:
    cwd -> current working directory
    exe -> executed program
    root -> /proc/root
-   maps -> files mapped by the process (as in /proc/PID/maps)
+   maps -> files mapped by the process (as in /proc/PID/maps; full paths,
+           including spaces and a ' (deleted)' suffix if present)
    fds -> a dictionary: { file_desriptor=file_name, ... }
 
 The only difference is that Pid class instance has 'parent' attribute:
@@ -68,9 +69,9 @@ if __name__ != '__main__':
                        readproc_by_pid, readproc_dict
 
 class _ProcDirInternals(object):
-   def __getmaps__(self, pid):
-      """Parse the /proc/PID/maps file. Return a list of mapped files
-      for the PID 'pid'.
+   def __getmaps__(self, base):
+      """Parse the /proc/PID/maps file, where 'base' is the /proc/PID/
+      directory. Return a list of mapped files.
       Usage:
       >>> import procpy
       >>> proc_table = procpy.Proc()
@@ -82,26 +83,31 @@ class _ProcDirInternals(object):
       """
 
       maps = []
+      seen = set()
 
       try:
-         mapsfile = open("/proc/%d/maps" % (pid), 'r')
+         mapsfile = open(base + "maps", 'r')
       except IOError:
          return maps
 
-      for line in mapsfile:
-         try:
-            fname = line.split()[5]
-         except IndexError:
-            continue
+      with mapsfile:
+         for line in mapsfile:
+            # the path is everything after the fifth column, spaces included
+            try:
+               fname = line.split(None, 5)[5]
+            except IndexError:
+               continue
 
-         if fname not in maps:
-            maps.append(fname)
+            if fname not in seen:
+               seen.add(fname)
+               maps.append(fname.rstrip('\n'))
 
-      mapsfile.close()
       return maps
 
-   def __getlink__(self, pid, fnam):
-      """Read links for /proc/PID/[cwd, exe, root].
+   def __getlinks__(self, base):
+      """Read links for /proc/PID/[cwd, exe, root], where 'base' is
+      the /proc/PID/ directory. Return a dictionary:
+      { 'cwd': 'link', 'exe': 'link', 'root': 'link' }
       Usage:
       >>> import os
       >>> import procpy
@@ -111,13 +117,19 @@ class _ProcDirInternals(object):
       True
 
       """
-      try:
-         return os.readlink("/proc/%d/%s" % (pid, fnam))
-      except:
-         return ''
+      links = {}
 
-   def __getfds__(self, pid):
-      """Read the contents of /proc/PID/fd/ directory. Return a directory:
+      for fnam in ('cwd', 'exe', 'root'):
+         try:
+            links[fnam] = os.readlink(base + fnam)
+         except OSError:
+            links[fnam] = ''
+
+      return links
+
+   def __getfds__(self, base):
+      """Read the contents of /proc/PID/fd/ directory, where 'base' is
+      the /proc/PID/ directory. Return a directory:
       { 'file_descriptor': 'file_link', ... }
       Usage:
       >>> import procpy
@@ -133,36 +145,75 @@ class _ProcDirInternals(object):
       """
       
       fds = {}
+      path = base + "fd/"
 
       try:
-         dir_entries = os.listdir("/proc/%d/fd/" % (pid))
-      except:
+         dir_entries = os.listdir(path)
+      except OSError:
          return fds
 
       for dir_entry in dir_entries:
-         if dir_entry == '.' or dir_entry == '..':
-            continue
-         
+         # the descriptor may be closed while we are scanning
          try:
-            fds[int(dir_entry)] = os.readlink('/proc/%d/fd/%s' % (pid, dir_entry))
-         except:
+            fds[int(dir_entry)] = os.readlink(path + dir_entry)
+         except OSError:
             continue
 
-      del dir_entries
       return fds
 
+   def __enrich__(self, pid):
+      """Gather the data readproc does not provide for the PID 'pid'.
+      Return a dictionary with 'maps', 'cwd', 'exe', 'root' and 'fds' keys."""
+
+      base = "/proc/%d/" % (pid)
+
+      info = self.__getlinks__(base)
+      info['maps'] = self.__getmaps__(base)
+      info['fds'] = self.__getfds__(base)
+
+      return info
+
 
 class _InitProc(_ProcDirInternals):
    """This class is inherited by Proc class. Basically it contains
    update method used by Proc class at its initialization."""
 
+   # almost all the work done per PID in update() is waiting on /proc, so
+   # on machines with several CPUs and enough PIDs it is spread over a pool
+   # of threads; the pool is shared by all instances and created on first
+   # use. A forked child inherits the pool object but not its worker
+   # threads, so the pool is rebuilt when the PID changes.
+   _pool = None
+   _pool_pid = None
+   _POOL_MAX_SIZE = 16
+   _POOL_MIN_PIDS = 256
+
+   def __getpool__(self):
+      """Return the thread pool for update() or None if the PIDs
+      should be read sequentially"""
+
+      if len(self.pids) < self._POOL_MIN_PIDS:
+         return None
+
+      try:
+         size = min(self._POOL_MAX_SIZE, os.sysconf('SC_NPROCESSORS_ONLN'))
+      except (ValueError, OSError):
+         return None
+
+      if size < 2:
+         return None
+
+      if _InitProc._pool is None or _InitProc._pool_pid != os.getpid():
+         from multiprocessing.pool import ThreadPool
+         _InitProc._pool = ThreadPool(size)
+         _InitProc._pool_pid = os.getpid()
+
+      return _InitProc._pool
+
    def __getpids__(self):
       """Returns a tuple of all the PIDs found in /proc directory"""
 
-      pids = []
-      for p in self.procs:
-         pids.append(p)
-      return tuple(sorted(pids))
+      return tuple(sorted(self.procs))
 
    def update(self):
       """Sets self.procs as a dictionary of dictionaries:
@@ -172,12 +223,15 @@ class _InitProc(_ProcDirInternals):
       self.procs = readproc_dict()
       self.pids = self.__getpids__()
 
-      for pid in self.pids:
-         self.procs[pid]['maps'] = self.__getmaps__(pid)
-         self.procs[pid]['cwd'] = self.__getlink__(pid, 'cwd')
-         self.procs[pid]['exe'] = self.__getlink__(pid, 'exe')
-         self.procs[pid]['root'] = self.__getlink__(pid, 'root')
-         self.procs[pid]['fds'] = self.__getfds__(pid)
+      pool = self.__getpool__()
+      if pool is None:
+         infos = map(self.__enrich__, self.pids)
+      else:
+         infos = pool.map(self.__enrich__, self.pids)
+
+      procs = self.procs
+      for pid, info in zip(self.pids, infos):
+         procs[pid].update(info)
 
 
 class Proc(_InitProc):
@@ -214,13 +268,7 @@ class Proc(_InitProc):
 
 class _InitProcRT(object):
    def __getpids__(self):
-      import os, re
-      pids = []
-      for d in os.listdir("/proc/"):
-         if re.match("\d+", d):
-            pids.append(int(d))
-
-      return tuple(pids)
+      return tuple([int(d) for d in os.listdir("/proc") if d.isdigit()])
 
 
 class ProcRT(_InitProcRT, _ProcDirInternals):
@@ -269,32 +317,37 @@ class ProcRT(_InitProcRT, _ProcDirInternals):
 
    def pidinfo(self, pid):
       self.pinfo = readproc_by_pid(pid)
-      self.pinfo['maps'] = self.__getmaps__(pid)
-      self.pinfo['cwd'] = self.__getlink__(pid, 'cwd')
-      self.pinfo['exe'] = self.__getlink__(pid, 'exe')
-      self.pinfo['root'] = self.__getlink__(pid, 'root')
-      self.pinfo['fds'] = self.__getfds__(pid)
+      self.pinfo.update(self.__enrich__(pid))
 
       return self.pinfo
 
 
 class _Parent(_ProcDirInternals):
-   """Used by Pid class. Creates and fills pid.parent attribute"""
+   """Used by Pid class. Creates and fills pid.parent attribute.
+   The expensive 'maps' and 'fds' attributes are read on first access."""
 
    def __init__(self, ppid):
       self.pid = ppid
+      self.base = "/proc/%d/" % (ppid)
       pinfo = readproc_by_pid(ppid)
-      pinfo['maps'] = self.__getmaps__(ppid)
-      pinfo['cwd'] = self.__getlink__(ppid, 'cwd')
-      pinfo['exe'] = self.__getlink__(ppid, 'exe')
-      pinfo['root'] = self.__getlink__(ppid, 'root')
-      pinfo['fds'] = self.__getfds__(ppid)
+      pinfo.update(self.__getlinks__(self.base))
 
       for key in pinfo:
          setattr(self, key, pinfo[key])
 
       del pinfo
 
+   def __getattr__(self, name):
+      if name == 'maps':
+         value = self.__getmaps__(self.base)
+      elif name == 'fds':
+         value = self.__getfds__(self.base)
+      else:
+         raise AttributeError(name)
+
+      setattr(self, name, value)
+      return value
+
 
 class Pid(_ProcDirInternals):
    """
@@ -319,20 +372,25 @@ class Pid(_ProcDirInternals):
    def __init__(self, pid):
       self.pid = pid
       pinfo = readproc_by_pid(pid)
-      pinfo['maps'] = self.__getmaps__(pid)
-      pinfo['cwd'] = self.__getlink__(pid, 'cwd')
-      pinfo['exe'] = self.__getlink__(pid, 'exe')
-      pinfo['root'] = self.__getlink__(pid, 'root')
-      pinfo['fds'] = self.__getfds__(pid)
+      pinfo.update(self.__enrich__(pid))
 
       for key in pinfo:
          setattr(self, key, pinfo[key])
 
-      if pinfo['ppid'] > 0:
-         self.parent = _Parent(pinfo['ppid'])
-
+      self._parent = None
       del pinfo
 
+   def __get_parent(self):
+      if self.ppid <= 0:
+         raise AttributeError('parent')
+
+      if self._parent is None:
+         self._parent = _Parent(self.ppid)
+
+      return self._parent
+
+   parent = property(__get_parent, doc="Read the parent process on first access")
+
 def _test():
    import doctest
    os.symlink('build/_procpy.so', '_procpy.so')
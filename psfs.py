@@ -5,8 +5,10 @@ import os
 import sys
 import stat
 import errno
+import signal
 import logging
 import re
+import time
 import procpy
 
 fuse.fuse_python_api = (0, 2)
@@ -37,6 +39,11 @@ def setUpLogging():
 
 
 class PsStat(fuse.Stat):
+	# a PsStat is created for every getattr call
+	__slots__ = ('st_mode', 'st_ino', 'st_dev', 'st_nlink', 'st_uid', 'st_gid',
+			'st_size', 'st_atime', 'st_mtime', 'st_ctime', 'st_blocks',
+			'st_blksize', 'st_rdev')
+
 	def __init__(self):
 		self.st_mode = 0
 		self.st_ino = 0
@@ -56,26 +63,78 @@ class PsStat(fuse.Stat):
 class PsFS(fuse.Fuse):
 
 	infoFiles = ['USER', 'PID', 'CPU', 'MEM', 'TTY', 'START', 'TIME', 'COMMAND']
+	infoSet = frozenset(infoFiles)
+
+	# info file name -> function formatting its contents from a process entry
+	infoFormatters = {
+		'PID': lambda proc: str(proc['tid']),
+		'USER': lambda proc: proc['ruser'],
+		'CPU': lambda proc: proc['pcpustr'],
+		'MEM': lambda proc: proc['pmemstr'],
+		'TTY': lambda proc: proc['ttynam'],
+		'START': lambda proc: "%02d:%02d" % (proc['start'][3], proc['start'][4]),
+		'TIME': lambda proc: "%4d:%02d" % (proc['time'][0], proc['time'][1]),
+		'COMMAND': lambda proc: ' '.join(proc['cmdline']),
+	}
+
+	# process directories are named 'cmd(PID)'
+	pidRegex = re.compile(r'\((\d+)\)$')
+
+	# seconds a snapshot of the process table is reused for
+	procIndexTTL = 1.0
+
+	# seconds the info of a single process is reused for; FUSE stats a
+	# file (to get its size) right before reading it
+	procInfoTTL = 0.5
+	procInfoCacheSize = 256
 
 	def __init__(self, *args, **kw):
 		fuse.Fuse.__init__(self, *args, **kw)
 
+		self.procIndex = None
+		self.procIndexTime = 0
+		self.procInfoCache = {}
+
 	def getPid(self, procName):
-		try:
-			return int(re.search('\w+\((?P<num>\d+)\)', procName).group('num'))
-		except AttributeError:
+		match = self.pidRegex.search(procName)
+		if match is None:
 			return 0
 
+		return int(match.group(1))
+
 	def getProcessInfo(self, pid):
-		return procpy.readproc_by_pid(pid)
+		now = time.time()
+		cached = self.procInfoCache.get(pid)
+		if cached is not None and 0 <= now - cached[0] < self.procInfoTTL:
+			return cached[1]
+
+		if len(self.procInfoCache) >= self.procInfoCacheSize:
+			for key, (stamp, info) in self.procInfoCache.items():
+				if not 0 <= now - stamp < self.procInfoTTL:
+					del self.procInfoCache[key]
+
+		info = procpy.readproc_by_pid(pid)
+		self.procInfoCache[pid] = (now, info)
+
+		return info
+
+	def getProcessIndex(self):
+		now = time.time()
+		if self.procIndex is None or not 0 <= now - self.procIndexTime < self.procIndexTTL:
+			children = {}
+			parents = {}
+			for proc in procpy.readproc():
+				children.setdefault(proc['ppid'], []).append(proc)
+				parents[proc['tid']] = proc['ppid']
+
+			self.procIndex = (children, parents)
+			self.procIndexTime = now
+
+		return self.procIndex
 
 	def getChildProcessInfo(self, pid):
-		results = []
-		for proc in procpy.readproc():
-			if proc['ppid'] == pid:
-				results.append(proc)
-		
-		return results
+		children = self.getProcessIndex()[0]
+		return children.get(pid, [])
 	
 	def isExist(self, parent, child):
 		ppid = self.getPid(parent)
@@ -84,14 +143,11 @@ class PsFS(fuse.Fuse):
 		if ppid == 0 or pid == 0:
 			return False
 
-		info = self.getProcessInfo(pid)
-		if info['ppid'] <> ppid:
-			return False
-
-		return True
+		parents = self.getProcessIndex()[1]
+		return parents.get(pid) == ppid
 	
 	def makeProcName(self, procName, pid):
-		return procName + '(' + str(pid) + ')'
+		return '%s(%d)' % (procName, pid)
 			
 	def readdir(self, path, offset):
 		yield fuse.Direntry('.')
@@ -121,14 +177,13 @@ class PsFS(fuse.Fuse):
 		st = PsStat()
 		elem = path.split('/')
 
-		for info in self.infoFiles:
-			if elem[-1] == info:
-				st.st_mode = stat.S_IFREG | 0444
-				st.st_ino = 0
-				
-				pid = self.getPid(elem[-2])
-				st.st_size = len(self.getFileInfo(pid, info)) + 1
-				return st
+		if elem[-1] in self.infoSet:
+			st.st_mode = stat.S_IFREG | 0444
+			st.st_ino = 0
+
+			pid = self.getPid(elem[-2])
+			st.st_size = len(self.getFileInfo(pid, elem[-1])) + 1
+			return st
 
 		if path == "/":
 			st.st_mode = stat.S_IFDIR | 0555
@@ -153,34 +208,18 @@ class PsFS(fuse.Fuse):
 
 		elem = path.split('/')
 
-		for info in self.infoFiles:
-			if elem[-1] == info:
-				return 0;
+		if elem[-1] in self.infoSet:
+			return 0
 
 		return -errno.ENOENT
 	
 	def getFileInfo(self, pid, info):
-		proc = self.getProcessInfo(pid)
-
-		if info == "PID":
-			return str(proc['tid'])
-		elif info == "USER":
-			return proc['ruser']
-		elif info == "CPU":
-			return proc['pcpustr']
-		elif info == "MEM":
-			return proc['pmemstr']
-		elif info == "TTY":
-			return proc['ttynam']
-		elif info == "START":
-			return "%02d:%02d" % (proc['start'][3], proc['start'][4])
-		elif info == "TIME":
-			return "%4d:%02d" % (proc['time'][0], proc['time'][1])
-		elif info == "COMMAND":
-			return ' '.join(proc['cmdline'])
-		else:
+		formatter = self.infoFormatters.get(info)
+		if formatter is None:
 			return ''
 
+		return formatter(self.getProcessInfo(pid))
+
 
 	def read(self, path, size, offset):
 		if path == '/':
@@ -188,13 +227,12 @@ class PsFS(fuse.Fuse):
 
 		elem = path.split('/')
 
-		for info in self.infoFiles:
-			if elem[-1] == info:
-				pid = self.getPid(elem[-2])
-				if pid == 0:
-					return -errno.ENOENT
+		if elem[-1] in self.infoSet:
+			pid = self.getPid(elem[-2])
+			if pid == 0:
+				return -errno.ENOENT
 
-				return self.getFileInfo(pid, info) + '\n'
+			return self.getFileInfo(pid, elem[-1]) + '\n'
 
 		return -errno.ENOENT
 	
@@ -207,8 +245,14 @@ class PsFS(fuse.Fuse):
 		if pid == 0:
 			return -errno.EINVAL
 
-		killcmd = 'kill -9 ' + str(pid)
-		os.system(killcmd)
+		try:
+			os.kill(pid, signal.SIGKILL)
+		except OSError, e:
+			return -e.errno
+
+		# do not serve the killed process from the cached snapshots
+		self.procIndex = None
+		self.procInfoCache.pop(pid, None)
 
 		return 0
 